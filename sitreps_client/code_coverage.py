@@ -3,15 +3,20 @@
 import logging
 import re
 from typing import Optional
-
-import requests
+from typing import Pattern
+from typing import Union
 
 from sitreps_client.exceptions import CodeCoverageError
 from sitreps_client.exceptions import SitrepsError
 from sitreps_client.utils.ci_downloader import CIDownloader
+from sitreps_client.utils.helpers import get_session
+from sitreps_client.utils.helpers import json_loads
 
 LOGGER = logging.getLogger(__name__)
 
+_SESSION = get_session()
+_HTMLCOV_RE = re.compile(r'<span class="pc_cov">([0-9]+)%</span>')
+
 
 class CodecovCoverage:
     """Code coverage from codecov.io."""
@@ -25,7 +30,7 @@ class CodecovCoverage:
 
         url = f"https://api.codecov.io/api/v2/github/{org}/repos/{repo}"
         headers = {"accept": "application/json"}
-        response = requests.get(url=url, headers=headers)
+        response = _SESSION.get(url=url, headers=headers, timeout=5)
 
         if response.status_code == 404:
             msg = f'code-coverage not available for "{self.repo_slug}"'
@@ -37,7 +42,7 @@ class CodecovCoverage:
             LOGGER.error(msg)
             return None
 
-        response_json = response.json()
+        response_json = json_loads(response.content)
         if response_json["active"]:
             totals = response_json["totals"]
             return {
@@ -55,22 +60,34 @@ class CodecovCoverage:
         return f"<CodecovCoverage(repo_slug={self.repo_slug})>"
 
 
-def get_regex_cov(pattern: str, string: str) -> Optional[float]:
-    """Return coverage matched by regex pattern."""
-    match = re.search(pattern, string)
+def _compile_cov_pattern(pattern: Union[str, Pattern]) -> Pattern:
+    """Compile coverage pattern, which must capture the coverage value in group 1."""
+    compiled = re.compile(pattern)
+    if not compiled.groups:
+        raise ValueError(f"Coverage pattern '{compiled.pattern}' must have a capture group.")
+    return compiled
+
+
+def get_regex_cov(pattern: Union[str, Pattern], string: str) -> Optional[float]:
+    """Return coverage matched by regex pattern (string or compiled).
+
+    The pattern must capture the coverage value in its first group, else `ValueError` is raised.
+    """
+    pattern = _compile_cov_pattern(pattern)
+    match = pattern.search(string)
     if match is None:
         return None
 
     try:
-        return float(match.group(1))
-    except (IndexError, ValueError) as err:
+        return float(match[1])
+    except (TypeError, ValueError) as err:
         LOGGER.warning("Coverage, failure: %s", str(err))
         return None
 
 
 def get_htmlcov(string: str) -> Optional[float]:
     """Return coverage from "htmlcov" index.html generated by Coverage.py."""
-    return get_regex_cov('<span class="pc_cov">([0-9]+)%</span>', string)
+    return get_regex_cov(_HTMLCOV_RE, string)
 
 
 class CICoverage:
@@ -79,13 +96,14 @@ class CICoverage:
     Args:
         url (str): CI raw link (eg. jenkins job raw link)
         ci_downloader (CIDownloader): Instance of CI downloader (eg. JenkinsDownloader)
-        pattern (str, optional): Match pattern
+        pattern (str, optional): Match pattern, capturing the coverage value in group 1
     """
 
     def __init__(self, url: str, ci_downloader: CIDownloader, pattern: Optional[str] = None):
         self.url = url
         self.ci_downloader = ci_downloader
         self.pattern = pattern
+        self._pattern = _compile_cov_pattern(pattern) if pattern else None
 
     def get_coverage(self) -> Optional[float]:
         """Get coverage info."""
@@ -97,9 +115,9 @@ class CICoverage:
                 f"Failed to get code coverage for url {self.url}, error: {str(err)}"
             )
 
-        if not self.pattern:
+        if self._pattern is None:
             return get_htmlcov(string)
-        return get_regex_cov(self.pattern, string)
+        return get_regex_cov(self._pattern, string)
 
     def __repr__(self):
         return f"<CICoverage(url={self.url})>"
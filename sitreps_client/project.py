@@ -13,9 +13,13 @@ from sitreps_client.utils.helpers import merge_dicts
 from sitreps_client.utils.path import CONF_PATH
 
 SUPPORTED_HOSTS = ("github", "gitlab-cee", "gitlab")
-SUPPORTED_CLOC_ARGS = {"suffix", "folders_to_skip", "names_to_skip", "exclude_tests", "auth_token"}
-SUPPORTED_UNITTEST_ARGS = {"travis", "gh_action", "jenkins"}
-SUPPORTED_SONARQUBE_ARGS = {"project_key", "host", "token"}
+# (host, domain fragment matched in the repository url)
+_PROVIDER_MAP = tuple((host, host.replace("-", ".")) for host in SUPPORTED_HOSTS)
+SUPPORTED_CLOC_ARGS = frozenset(
+    {"suffix", "folders_to_skip", "names_to_skip", "exclude_tests", "auth_token"}
+)
+SUPPORTED_UNITTEST_ARGS = frozenset({"travis", "gh_action", "jenkins"})
+SUPPORTED_SONARQUBE_ARGS = frozenset({"project_key", "host", "token"})
 LOGGER = getLogger(__name__)
 
 
@@ -51,20 +55,20 @@ class Repository:
         self._sonarqube = sonarqube if sonarqube else {}
         self._unit_tests = unit_tests if unit_tests else {}
 
-        if self._cloc and not set(self._cloc.keys()).issubset(SUPPORTED_CLOC_ARGS):
+        if self._cloc and not self._cloc.keys() <= SUPPORTED_CLOC_ARGS:
             raise ValueError(
-                f"Supported cloc params are: {SUPPORTED_CLOC_ARGS} and provided: "
+                f"Supported cloc params are: {sorted(SUPPORTED_CLOC_ARGS)} and provided: "
                 f"{self._cloc.keys()}"
             )
-        if self._sonarqube and not set(self._sonarqube.keys()).issubset(SUPPORTED_SONARQUBE_ARGS):
+        if self._sonarqube and not self._sonarqube.keys() <= SUPPORTED_SONARQUBE_ARGS:
             raise ValueError(
-                f"Supported sonarqube params are: {SUPPORTED_SONARQUBE_ARGS} and provided: "
+                f"Supported sonarqube params are: {sorted(SUPPORTED_SONARQUBE_ARGS)} and provided: "
                 f"{self._sonarqube.keys()}"
             )
 
-        if self._unit_tests and not set(self._unit_tests.keys()).issubset(SUPPORTED_UNITTEST_ARGS):
+        if self._unit_tests and not self._unit_tests.keys() <= SUPPORTED_UNITTEST_ARGS:
             raise ValueError(
-                f"Supported unit tests params are: {SUPPORTED_UNITTEST_ARGS} and provided: "
+                f"Supported unit tests params are: {sorted(SUPPORTED_UNITTEST_ARGS)} and provided: "
                 f"{self._unit_tests.keys()}"
             )
 
@@ -80,7 +84,7 @@ class Repository:
             unit_tests=rep_conf.get("unit_tests"),
         )
 
-    @property
+    @cached_property
     def repo_slug(self):
         """Return repo-slug of repository."""
         url = self.url.rstrip("/")
@@ -95,8 +99,8 @@ class Repository:
     @cached_property
     def provider(self):
         """Return host of repository ["github", "gitlab-cee" ,"gitlab"]."""
-        for _host in SUPPORTED_HOSTS:
-            if _host.replace("-", ".") in self.url:
+        for _host, needle in _PROVIDER_MAP:
+            if needle in self.url:
                 return _host
         raise ValueError(f"'{self.url}' not supported url. Sitreps only support {SUPPORTED_HOSTS}")
 
@@ -188,7 +192,7 @@ class Project:
         conf = merge_dicts(self.default_config, comp_conf)
         return conf
 
-    @property
+    @cached_property
     def repositories(self):
         """Return list repository objects."""
         config = self.config
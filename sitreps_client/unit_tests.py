@@ -1,11 +1,16 @@
 """Numbers of unit tests for repositories."""
 
+import io
 import logging
 import re
-from pathlib import Path
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AnyStr
 from typing import Generator
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
-from uuid import uuid4
 from zipfile import ZipFile
 
 import requests
@@ -17,10 +22,14 @@ from sitreps_client.exceptions import UnitTestError
 from sitreps_client.utils.ci_downloader import CIDownloader
 from sitreps_client.utils.ci_downloader import JenkinsDownloader
 from sitreps_client.utils.helpers import escape_ansi
-from sitreps_client.utils.helpers import wait_for
+from sitreps_client.utils.helpers import get_session
+from sitreps_client.utils.helpers import json_loads
 
 LOGGER = logging.getLogger(__name__)
 
+# Shared by GitHub Actions requests, keeps the api.github.com connection alive between calls.
+_GH_SESSION = get_session()
+
 KNOWN_TESTING_TOOLS = (
     "gotest",
     "pytest",
@@ -33,6 +42,117 @@ KNOWN_TESTING_TOOLS = (
     "busted",
 )
 
+# At these markers all test runs are already completed.
+_STOP_MARKERS = ("https://codecov.io/upload", "bonfire deploy-iqe-cji")
+_STOP_MARKERS_BYTES = tuple(marker.encode() for marker in _STOP_MARKERS)
+# Per line checks, in order: (log label, testing tool, literals all on the line, regex, then).
+# The first literal finds candidate lines. `then` is "stop" to end the scan, "next" to go on with
+# the next line, or None to go on with the next check on the same line.
+_LINE_RULES = (
+    ("gotest-module", "gotest", ("=== RUN ",), None, "next"),
+    ("gotest", "gotest", (" Specs in",), r"^Ran [0-9]+ of ([0-9]+) Specs in", None),
+    ("pytest", "pytest", ("collected ", " items"), r"collected ([0-9]+) items", "stop"),
+    ("pyunittest", "pyunittest", (" tests in ", "Ran "), r"Ran ([0-9]+) tests in", "stop"),
+    ("npm", "npm", ("Tests:", " total"), r"Tests:.+, ([0-9]+) total", "stop"),
+    ("rake", "rake", ("assertions", "tests", "failures"), r"([0-9]+) tests,", "stop"),
+    (
+        "maven",
+        "maven",
+        ("Tests run", "Failures", "Errors", "Skipped"),
+        r"Tests run: ([0-9]+),",
+        "next",
+    ),
+    ("junit", "junit", ("Executed ", " tests"), r"Executed ([0-9]+) tests", "stop"),
+    (
+        "busted",
+        "busted",
+        ("successes ", "failures"),
+        r"([0-9]+) successes / ([0-9]+) failures / ([0-9]+) errors / ([0-9]+) pending",
+        "stop",
+    ),
+    ("other", "other", ("Suite duration: ", " Tests: "), r"Tests: ([0-9]+)", "next"),
+)
+
+# (testing tool, literals, same line literals); the tool is detected if any of the literals is in
+# the log or all of the same line literals are on one line.
+_TOOL_MARKERS = (
+    ("gotest", ("=== RUN ",), ()),
+    ("pytest", ("pytest", "py.test"), ()),
+    ("pyunittest", (), (" tests in ", "Ran ")),
+    ("other", (), ("Suite duration: ", " Tests: ")),
+    ("npm", ("npm", "yarn test"), ()),
+    ("rake", (), ("rake ", "validate")),
+    ("maven", ("maven",), ()),
+    ("busted", ("lualib",), ()),
+)
+
+
+@lru_cache(maxsize=None)
+def _tool_markers(binary: bool = False) -> tuple:
+    """Return `_TOOL_MARKERS`, encoded for `bytes` logs with `binary`."""
+    if not binary:
+        return _TOOL_MARKERS
+    return tuple(
+        (tool, tuple(m.encode() for m in literals), tuple(m.encode() for m in same_line))
+        for tool, literals, same_line in _TOOL_MARKERS
+    )
+
+
+@lru_cache(maxsize=None)
+def _line_rules(binary: bool = False) -> tuple:
+    """Return `_LINE_RULES` with compiled regexes, encoded for `bytes` logs with `binary`."""
+    rules = []
+    for label, tool, literals, pattern, then in _LINE_RULES:
+        if binary:
+            literals = tuple(literal.encode() for literal in literals)
+            pattern = pattern.encode() if pattern else None
+        regex = re.compile(pattern) if pattern else None
+        rules.append((label, tool, literals, regex, then))
+    return tuple(rules)
+
+
+def _printable(line: AnyStr) -> str:
+    """Return log line as text for log messages."""
+    return line.decode(errors="replace") if isinstance(line, bytes) else line
+
+
+# Line boundaries of `str.splitlines` as they appear in UTF-8 encoded bytes.
+_BYTES_LINE_BREAK_RE = re.compile(rb"\r\n|[\n\r\v\f\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+def _candidate_lines(ci_log: AnyStr, tokens: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    """Yield, in log order, the lines of `ci_log` containing any of the literal `tokens`.
+
+    Hits are found with `find`, so no regex runs over the rest of the log. Lines are split on the
+    same boundaries as `str.splitlines`, also for `bytes` logs.
+    """
+    binary = isinstance(ci_log, bytes)
+    newline = b"\n" if binary else "\n"
+    hits = {}
+    for token in dict.fromkeys(tokens):
+        needle = token.encode() if binary and isinstance(token, str) else token
+        pos = ci_log.find(needle)
+        if pos != -1:
+            hits[needle] = pos
+
+    while hits:
+        pos = min(hits.values())
+        start = ci_log.rfind(newline, 0, pos) + 1
+        end = ci_log.find(newline, pos)
+        if end == -1:
+            end = len(ci_log)
+
+        chunk = ci_log[start:end]
+        yield from _BYTES_LINE_BREAK_RE.split(chunk) if binary else chunk.splitlines()
+
+        for needle, pos in list(hits.items()):
+            if pos < end:
+                pos = ci_log.find(needle, end + 1)
+                if pos == -1:
+                    del hits[needle]
+                else:
+                    hits[needle] = pos
+
 
 class TokenAuth(AuthBase):
     """Github token base authentication scheme."""
@@ -51,31 +171,27 @@ class BaseUnitTests:
     """Base for UnitTests Collection."""
 
     @staticmethod
-    def _get_testing_tools(ci_log: str):
-        """Collect UnitTest tools."""
-        tools_found = []
-        ci_log = escape_ansi(ci_log)
+    def _get_testing_tools(ci_log: AnyStr):
+        """Collect UnitTest tools.
+
+        Args:
+            ci_log (str, bytes): CI log, already stripped of ANSI escapes.
+        """
+        tools_found = set()
         LOGGER.info("[UnitTests]: Collecting unit test tools...")
 
-        for line in ci_log.splitlines():
-            if "=== RUN " in line:
-                tools_found.append("gotest")
-            if "pytest" in line or "py.test" in line:
-                tools_found.append("pytest")
-            if "Ran " in line and " tests in " in line:
-                tools_found.append("pyunittest")
-            if "Suite duration: " in line and " Tests: " in line:
-                tools_found.append("other")
-            if "npm" in line or "yarn test" in line:
-                tools_found.append("npm")
-            if "rake " in line and "validate" in line:
-                tools_found.append("rake")
-            if "maven" in line:
-                tools_found.append("maven")
-            if "lualib" in line:
-                tools_found.append("busted")
-
-        tools_found = set(tools_found)
+        # Presence is all we need, so search the whole log once per marker instead of per line.
+        # Same line markers are looked for on lines only when all of them are in the log.
+        for tool, literals, same_line in _tool_markers(isinstance(ci_log, bytes)):
+            if any(literal in ci_log for literal in literals) or (
+                same_line
+                and all(marker in ci_log for marker in same_line)
+                and any(
+                    all(marker in line for marker in same_line)
+                    for line in _candidate_lines(ci_log, same_line[:1])
+                )
+            ):
+                tools_found.add(tool)
 
         if len(tools_found) > 1:
             LOGGER.warning(
@@ -88,135 +204,72 @@ class BaseUnitTests:
 
         return tools_found
 
-    def _get_tests_count(self, ci_log: str, test_tool: Optional[str] = None) -> int:  # noqa: C901
+    def _get_tests_count(self, ci_log: AnyStr, test_tool: Optional[str] = None) -> int:
         """Identify number of unit tests from the CI log.
 
         Try to parse output of various unit testing tools (pytest, rake, etc.).
 
         Args:
-            ci_log (str): Decoded CI log
+            ci_log (str, bytes): CI log; raw `bytes` are matched as is, without decoding.
             test_tool (str): Comma separated tools. If not provided it will try to fetch from log.
         """
-        # pylint: disable=too-many-branches
         tests_count = 0
         go_test_module = 0
+        ci_log = escape_ansi(ci_log)
 
+        # A pinned tool skips the detection pass over the log.
         if test_tool:
-            tools = test_tool.split(",")
+            tools = frozenset(test_tool.split(","))
         else:
-            tools = self._get_testing_tools(ci_log)
+            tools = frozenset(self._get_testing_tools(ci_log))
+            if not tools:
+                return 0
 
-        LOGGER.info(f"[UnitTests]: testing tools: {tools}")
+        LOGGER.info(f"[UnitTests]: testing tools: {set(tools)}")
         if "gotest" in tools:
             LOGGER.warning(
                 "For go tests we don't have proper parsing as summary is not generated by default."
             )
-        for line in escape_ansi(ci_log).splitlines():
-            # At this point all test run already completed.
-            if "https://codecov.io/upload" in line or "bonfire deploy-iqe-cji" in line:
-                break
-
-            # GO tests
-            # TODO: We don't have option to properly parse go unit tests count. For now we are
-            #  considering moudle level as per log but its not correct.
-            if "gotest" in tools and "=== RUN " in line:
-                LOGGER.debug(f"gotest-module: {line}")
-                go_test_module += 1
-                continue
-            if "gotest" in tools and re.match("Ran ([0-9]+) of ([0-9]+) Specs in", line):
-                LOGGER.debug(f"gotest: {line}")
-                tests_count += int(
-                    re.search("Ran ([0-9]+) of ([0-9]+) Specs in", line).group(2)  # type: ignore
-                )
-
-            # pytest
-            if "pytest" in tools and "collected " in line and " items" in line:
-                LOGGER.debug(f"pytest: {line}")
-                try:
-                    tests_count += int(
-                        re.search("collected ([0-9]+) items", line).group(1)  # type: ignore
-                    )
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                break
-
-            # python unit tests
-            if "pyunittest" in tools and "Ran " in line and " tests in " in line:
-                LOGGER.debug(f"pyunittest: {line}")
-                try:
-                    tests_count += int(
-                        re.search("Ran ([0-9]+) tests in", line).group(1)  # type: ignore
-                    )
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                break
-
-            # javascript; npm/yarn
-            if "npm" in tools and "Tests:" in line and " total" in line:
-                LOGGER.debug(f"npm: {line}")
-                try:
-                    tests_count += int(
-                        re.search("Tests:.+, ([0-9]+) total", line).group(1)  # type: ignore
-                    )
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                break
-
-            # rake validate
-            if "rake" in tools and all(exp in line for exp in ("tests", "assertions", "failures")):
-                LOGGER.debug(f"rake: {line}")
-                try:
-                    tests_count += int(re.search("([0-9]+) tests,", line).group(1))  # type: ignore
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                break
+        binary = isinstance(ci_log, bytes)
+        stop_markers = _STOP_MARKERS_BYTES if binary else _STOP_MARKERS
+        rules = [rule for rule in _line_rules(binary) if rule[1] in tools]
+        tokens = [*_STOP_MARKERS] + [
+            literals[0] for __, tool, literals, __, __ in _LINE_RULES if tool in tools
+        ]
 
-            # maven java unit test
-            if "maven" in tools and all(
-                exp in line for exp in ("Tests run", "Failures", "Errors", "Skipped")
-            ):
-                LOGGER.debug(f"maven: {line}")
-                try:
-                    tests_count += int(re.search("Tests run: ([0-9]+),", line).group(1))
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                continue
-
-            # junit
-            if "junit" in tools and "Executed " in line and " tests" in line:
-                LOGGER.debug(f"junit: {line}")
-                try:
-                    tests_count += int(
-                        re.search("Executed ([0-9]+) tests", line).group(1)  # type: ignore
-                    )
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
+        finished = False
+        for line in _candidate_lines(ci_log, tokens):
+            # At this point all test run already completed.
+            if any(marker in line for marker in stop_markers):
                 break
 
-            # busted: is a unit testing framework with a focus on being easy to use. Supports
-            # Lua >= 5.1, luajit >= 2.0.0, and moonscript.
-            if "busted" in tools and "successes " in line and "failures" in line:
-                LOGGER.debug(f"busted: {line}")
-                try:
-                    tests = re.search(
-                        "([0-9]+) successes / ([0-9]+) failures / ([0-9]+) errors / "
-                        "([0-9]+) pending",
-                        line,
-                    )
-                    tests_count += sum([int(n) for n in tests.groups()])
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
+            for label, __, literals, regex, then in rules:
+                if not all(literal in line for literal in literals):
+                    continue
+                match = regex.search(line) if regex else None
+                if then is None and match is None:
+                    continue
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug(f"{label}: {_printable(line)}")
+
+                # GO tests
+                # TODO: We don't have option to properly parse go unit tests count. For now we
+                #  are considering moudle level as per log but its not correct.
+                if regex is None:
+                    go_test_module += 1
+                elif match is None:
+                    LOGGER.error(f"LogParsing: {label} summary not parsed: {_printable(line)}")
+                else:
+                    # busted reports successes / failures / errors / pending; sum them up.
+                    tests_count += sum(int(n) for n in match.groups())
+
+                if then == "stop":
+                    finished = True
+                if then is not None:
+                    break
+            if finished:
                 break
 
-            # ??
-            if "other" in tools and "Suite duration: " in line and " Tests: " in line:
-                LOGGER.debug(f"other: {line}")
-                try:
-                    tests_count += int(re.search("Tests: ([0-9]+)", line).group(1))  # type: ignore
-                except (IndexError, AttributeError) as e:
-                    LOGGER.error(f"LogParsing: {e}")
-                continue
-
         if tests_count:
             return tests_count
         return go_test_module
@@ -245,8 +298,8 @@ class GHActionUnitTests(BaseUnitTests):
 
     def get_runs(self):
         """Get github actions runs for repo."""
-        response, err, *__ = wait_for(
-            lambda: requests.get(
+        try:
+            response = _GH_SESSION.get(
                 self.GH_ACTION_RUNS.format(repo_slug=self.repo_slug),
                 params={
                     "branch": self.branch,
@@ -255,17 +308,17 @@ class GHActionUnitTests(BaseUnitTests):
                     "per_page": 75,
                 },
                 auth=self._auth,
-            ),
-            delay=2,
-            num_sec=3,
-            ignore_falsy=True,
-        )
+                timeout=5,
+            )
+        except requests.RequestException as e:
+            LOGGER.error(f"[GhAction-{self.repo_slug}]: Unable to fetch runs: {e}")
+            raise SitrepsError(f"Unable to fetch runs: {e}")
 
         if not response.ok:
             LOGGER.error(f"[GhAction-{self.repo_slug}]: Unable to fetch runs: {response.reason}")
             raise SitrepsError(f"Unable to fetch runs: {response.reason}")
 
-        data = response.json()
+        data = json_loads(response.content)
         runs = data.get("workflow_runs")
         if not runs:
             LOGGER.warning(
@@ -292,23 +345,24 @@ class GHActionUnitTests(BaseUnitTests):
             return logs
         run = runs[0]  # select first one
         LOGGER.info(f"[GhAction-{self.repo_slug}]: Latest run: {run['html_url']}")
-        response, err, *__ = wait_for(
-            lambda: requests.get(runs[0]["logs_url"], auth=TokenAuth(self.github_token)),
-            delay=2,
-            num_sec=7,
-        )
-        if not response.ok:
-            LOGGER.error(f"[GhAction-{self.repo_slug}]: Unable to fetch logs {response.reason}")
-            raise SitrepsError(f"Unable to fetch logs: {response.reason}")
-
-        zipfile_name = Path(f"/tmp/github_action_log_{uuid4()}.zip")
-
-        with open(zipfile_name, "wb") as f:
-            f.write(response.content)
-
-        with ZipFile(zipfile_name) as zip_log:
-            logfiles = [x for x in zip_log.infolist() if "/" not in x.filename]
-            logs = [zip_log.read(log) for log in logfiles]
+        try:
+            response = _GH_SESSION.get(run["logs_url"], auth=self._auth, stream=True, timeout=30)
+        except requests.RequestException as e:
+            LOGGER.error(f"[GhAction-{self.repo_slug}]: Unable to fetch logs {e}")
+            raise SitrepsError(f"Unable to fetch logs: {e}")
+
+        with response, io.BytesIO() as buf:
+            if not response.ok:
+                LOGGER.error(f"[GhAction-{self.repo_slug}]: Unable to fetch logs {response.reason}")
+                raise SitrepsError(f"Unable to fetch logs: {response.reason}")
+
+            # ZipFile needs a seekable file; spool the streamed body into memory once.
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, buf)
+            buf.seek(0)
+            with ZipFile(buf) as zip_log:
+                logfiles = [x for x in zip_log.infolist() if "/" not in x.filename]
+                logs = [zip_log.read(log) for log in logfiles]
         return logs
 
     def get_num_of_tests(self) -> Optional[int]:
@@ -320,7 +374,7 @@ class GHActionUnitTests(BaseUnitTests):
             return 0
 
         for log in logs:
-            num_of_tests = self._get_tests_count(log.decode(), test_tool=self.test_tool)
+            num_of_tests = self._get_tests_count(log, test_tool=self.test_tool)
             if num_of_tests > 0:
                 return num_of_tests
         return 0
@@ -486,10 +540,16 @@ def get_unit_tests(travis=None, gh_action=None, jenkins=None):
             test_tool=jenkins.get("test_tool"),
         )
 
-    for key, ci in unit_tests.items():
-        try:
-            unit_tests[key] = ci.get_num_of_tests()
-        except SitrepsError as e:
-            unit_tests[key] = 0
-            LOGGER.error(f"{e}")
+    if not unit_tests:
+        return unit_tests
+
+    # Collectors are independent and mostly wait on network I/O; run them concurrently.
+    with ThreadPoolExecutor(max_workers=len(unit_tests)) as executor:
+        futures = {key: executor.submit(ci.get_num_of_tests) for key, ci in unit_tests.items()}
+        for key, future in futures.items():
+            try:
+                unit_tests[key] = future.result()
+            except SitrepsError as e:
+                unit_tests[key] = 0
+                LOGGER.error(f"{e}")
     return unit_tests
@@ -1,26 +1,51 @@
 import json
+import random
 import re
 import time
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 from typing import Any
+from typing import AnyStr
+from typing import Callable
 from typing import Tuple
+from typing import Union
 
+import requests
 import yaml
 from box import Box
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without LibYAML
+    from yaml import SafeLoader as _YamlSafeLoader
 
 LOGGER = getLogger(__name__)
 
+_MAX_WAIT_DELAY = 8.0
+_MERGEABLE = (list, set, tuple)
+_ANSI_ESCAPE_RE = re.compile(r"(?:\x1B[@-_]|[\x80-\x9F])[0-?]*[ -/]*[@-~]")
+# Same for UTF-8 encoded bytes, where C1 control characters are encoded as two bytes.
+_ANSI_ESCAPE_BYTES_RE = re.compile(rb"(?:\x1B[@-_]|\xC2[\x80-\x9F])[0-?]*[ -/]*[@-~]")
+
 
 def wait_for(
     func, delay: float = 2.0, num_sec: float = 10.0, ignore_falsy: bool = False
 ) -> Tuple[Any, Any, int]:
-    """Wait for success of `func` for `num_sec`."""
-    end_time = time.time() + num_sec
+    """Wait for success of `func` for `num_sec`.
+
+    Retries are spaced starting at `delay` and doubling (with a little jitter) up to
+    `_MAX_WAIT_DELAY` seconds. The wait before the last try is cut to end at `num_sec`, and
+    `func` is tried once more there.
+    """
+    deadline = time.monotonic() + num_sec
+    wait = delay
 
     tries = 0
 
-    while time.time() < end_time:
+    while True:
         response = None
         err = None
         tries += 1
@@ -31,16 +56,54 @@ def wait_for(
         except Exception as exp:
             err = exp
             LOGGER.warning(f"{tries} tries fail, Handling exception: {err}")
-            continue
-
-        if response or ignore_falsy:
-            return response, err, tries
+        else:
+            if response or ignore_falsy:
+                return response, err, tries
 
-        time.sleep(delay)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(wait, remaining))
+        wait = min(wait * 2, _MAX_WAIT_DELAY) + random.uniform(0, 0.1)
 
     return response, err, tries
 
 
+def get_session(
+    total: int = 3,
+    backoff_factor: float = 1.0,
+    status_forcelist: Tuple[int, ...] = (500, 502, 503, 504),
+) -> requests.Session:
+    """Return a `requests.Session` retrying failed https requests with backoff.
+
+    Once retries are exhausted the last response is returned so callers can check `response.ok`.
+    """
+    retry = Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+@lru_cache(maxsize=None)
+def _json_loader() -> Callable[[Union[bytes, str]], Any]:
+    """Return `orjson.loads` if available else `json.loads`, imported on first use."""
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return json.loads
+    return orjson.loads
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON document, with `orjson` if available."""
+    return _json_loader()(data)
+
+
 def load_file(path):
     """Load a .json/.yml/.yaml file. (Logic taken from bonfire)"""
     if not isinstance(path, Path):
@@ -51,9 +114,9 @@ def load_file(path):
 
     with open(path, "rb") as f:
         if path.suffix in [".yaml", ".yml"]:
-            content = yaml.safe_load(f)
+            content = yaml.load(f, Loader=_YamlSafeLoader)
         elif path.suffix == ".json":
-            content = json.load(f)
+            content = json_loads(f.read())
         else:
             raise ValueError(f"File '{path}' must be a YAML or JSON file.")
 
@@ -65,19 +128,26 @@ def load_file(path):
 
 def merge_dicts(dict_a, dict_b):
     """Merge x into y."""
-    if not (isinstance(dict_a, dict) and isinstance(dict_b, dict)):
-        raise ValueError("Only dict can mergable.")
-
-    mergeable = (list, set, tuple)
-
-    for key, value in dict_b.items():
-        if key in dict_a and isinstance(value, mergeable) and isinstance(dict_a[key], mergeable):
-            new_list = set(dict_a[key]).union(value)
-            dict_a[key] = sorted(new_list)
-        elif key not in dict_a or not isinstance(value, dict):
-            dict_a[key] = value
-        else:
-            merge_dicts(dict_a[key], value)
+    stack = [(dict_a, dict_b)]
+
+    while stack:
+        target, source = stack.pop()
+        if not (isinstance(target, dict) and isinstance(source, dict)):
+            raise ValueError("Only dict can mergable.")
+
+        for key, value in source.items():
+            if key not in target:
+                target[key] = value
+                continue
+
+            current = target[key]
+            if isinstance(value, _MERGEABLE) and isinstance(current, _MERGEABLE):
+                # Sorted to keep the merged config deterministic.
+                target[key] = sorted(set(current).union(value))
+            elif isinstance(value, dict):
+                stack.append((current, value))
+            else:
+                target[key] = value
 
     return Box(dict_a)
 
@@ -90,7 +160,8 @@ def get_repo_slug(url: str) -> str:
     return repo_slug
 
 
-def escape_ansi(string: str) -> str:
-    """Remove escape characters from a string."""
-    ansi_escape = re.compile(r"(?:\x1B[@-_]|[\x80-\x9F])[0-?]*[ -/]*[@-~]")
-    return ansi_escape.sub("", string)
+def escape_ansi(string: AnyStr) -> AnyStr:
+    """Remove escape characters from a string (or UTF-8 bytes)."""
+    if isinstance(string, bytes):
+        return _ANSI_ESCAPE_BYTES_RE.sub(b"", string)
+    return _ANSI_ESCAPE_RE.sub("", string)
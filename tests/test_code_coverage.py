@@ -1,6 +1,11 @@
+import re
+
 import pytest
 
+from sitreps_client.code_coverage import CICoverage
 from sitreps_client.code_coverage import CodecovCoverage
+from sitreps_client.code_coverage import get_htmlcov
+from sitreps_client.code_coverage import get_regex_cov
 from sitreps_client.exceptions import CodeCoverageError
 
 
@@ -26,3 +31,37 @@ def test_code_coverage_branch(branch):
         with pytest.raises(CodeCoverageError) as error:
             codecov.get_coverage()
         assert "Branch not found" in str(error.value)
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["str", "compiled"])
+def test_regex_cov(compiled):
+    pattern = r"TOTAL .* ([0-9.]+)%"
+    pattern = re.compile(pattern) if compiled else pattern
+    assert get_regex_cov(pattern, "TOTAL 120 12 90.5%") == 90.5
+    assert get_regex_cov(pattern, "no coverage here") is None
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["str", "compiled"])
+def test_regex_cov_without_group(compiled):
+    pattern = r"TOTAL .* [0-9.]+%"
+    pattern = re.compile(pattern) if compiled else pattern
+    with pytest.raises(ValueError, match="must have a capture group"):
+        get_regex_cov(pattern, "TOTAL 120 12 90.5%")
+
+
+def test_ci_coverage_pattern_without_group():
+    with pytest.raises(ValueError, match="must have a capture group"):
+        CICoverage(url="https://ci.example.com/log", ci_downloader=None, pattern="TOTAL")
+
+
+@pytest.mark.parametrize(
+    "pattern, string",
+    [(r"TOTAL ([0-9.]+)?%", "TOTAL %"), (r"TOTAL (\S+)", "TOTAL abc")],
+    ids=["group-not-matched", "not-a-number"],
+)
+def test_regex_cov_unparsable(pattern, string):
+    assert get_regex_cov(pattern, string) is None
+
+
+def test_htmlcov():
+    assert get_htmlcov('<span class="pc_cov">87%</span>') == 87.0
@@ -0,0 +1,120 @@
+import logging
+
+import pytest
+
+from sitreps_client.unit_tests import BaseUnitTests
+
+TEST_LOGS = {
+    "pytest": ("pip install pytest\n\x1b[1mcollected 42 items\x1b[0m\ncollected 3 items\n", 42),
+    "pyunittest": ("python -m unittest\nRan 17 tests in 0.3s\nOK\n", 17),
+    "npm": ("npm test\nTests:       1 failed, 20 passed, 21 total\n", 21),
+    "rake": ("rake validate\n12 tests, 30 assertions, 0 failures, 0 errors\n", 12),
+    "maven": (
+        "maven\nTests run: 5, Failures: 0, Errors: 0, Skipped: 0\n"
+        "Tests run: 7, Failures: 0, Errors: 0, Skipped: 1\n",
+        12,
+    ),
+    "junit": ("Executed 9 tests\n", 9),
+    "busted": ("lualib\n3 successes / 1 failures / 0 errors / 2 pending\n", 6),
+    "other": ("Suite duration: 3s Tests: 11\n", 11),
+    "gotest": ("=== RUN TestA\n=== RUN TestB\n", 2),
+}
+
+
+@pytest.mark.parametrize("tool", TEST_LOGS.keys())
+def test_tests_count(tool):
+    log, expected = TEST_LOGS[tool]
+    assert BaseUnitTests()._get_tests_count(log, test_tool=tool) == expected
+
+
+def test_tests_count_stops_after_upload():
+    log = "pytest\nhttps://codecov.io/upload\ncollected 5 items\n"
+    assert BaseUnitTests()._get_tests_count(log, test_tool="pytest") == 0
+
+
+@pytest.mark.parametrize("tool", TEST_LOGS.keys())
+def test_tests_count_bytes(tool):
+    log, expected = TEST_LOGS[tool]
+    assert BaseUnitTests()._get_tests_count(log.encode(), test_tool=tool) == expected
+
+
+TOOL_DETECTION_LOGS = {
+    "gotest": ("go test ./...\n=== RUN TestA\n", {"gotest"}),
+    "pytest": ("python -m py.test\n", {"pytest"}),
+    "pyunittest": ("Ran 17 tests in 0.3s\n", {"pyunittest"}),
+    "pyunittest-split-lines": ("Ran \n tests in \n", set()),
+    "other": ("Suite duration: 3s Tests: 11\n", {"other"}),
+    "other-split-lines": ("Suite duration: 3s\n Tests: 11\n", set()),
+    "npm": ("yarn test\n", {"npm"}),
+    "rake": ("bundle exec rake validate\n", {"rake"}),
+    "rake-split-lines": ("rake x\nvalidate\n", set()),
+    "maven": ("maven build\n", {"maven"}),
+    "busted": ("/usr/lualib/busted\n", {"busted"}),
+    "multiple": ("pytest\nnpm install\n", {"pytest", "npm"}),
+    "none": ("nothing to see\n", set()),
+}
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+@pytest.mark.parametrize("case", TOOL_DETECTION_LOGS.keys())
+def test_get_testing_tools(case, encode):
+    log, expected = TOOL_DETECTION_LOGS[case]
+    assert BaseUnitTests._get_testing_tools(log.encode() if encode else log) == expected
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+@pytest.mark.parametrize("tool", sorted(set(TEST_LOGS) - {"junit"}))
+def test_tests_count_detect_tool(tool, encode):
+    log, expected = TEST_LOGS[tool]
+    log = log.encode() if encode else log
+    assert BaseUnitTests()._get_tests_count(log, test_tool=None) == expected
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+def test_tests_count_logs_whole_line(caplog, encode):
+    log = "=== RUN TestAlpha\nmaven\nTests run: 5, Failures: 0, Errors: 0, Skipped: 0\n"
+    log = log.encode() if encode else log
+    with caplog.at_level(logging.DEBUG, logger="sitreps_client.unit_tests"):
+        BaseUnitTests()._get_tests_count(log, test_tool="gotest,maven")
+    assert "gotest-module: === RUN TestAlpha" in caplog.messages
+    assert "maven: Tests run: 5, Failures: 0, Errors: 0, Skipped: 0" in caplog.messages
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+def test_tests_count_stop_marker_on_summary_line(encode):
+    log = "collected 5 items https://codecov.io/upload\n"
+    log = log.encode() if encode else log
+    assert BaseUnitTests()._get_tests_count(log, test_tool="pytest") == 0
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["12 tests, 30 assertions, 0 failures, 0 errors", "30 assertions, 12 tests, 0 failures"],
+    ids=["tests-first", "assertions-first"],
+)
+def test_tests_count_rake_any_order(line):
+    assert BaseUnitTests()._get_tests_count(f"{line}\n", test_tool="rake") == 12
+
+
+def test_tests_count_line_checked_in_tool_order():
+    # pytest is checked before maven on the same line, as in a line by line scan.
+    log = "Tests run: 2, Failures: 0, Errors: 0, Skipped: 0 collected 5 items\n"
+    assert BaseUnitTests()._get_tests_count(log, test_tool="pytest,maven") == 5
+    # "other" counts the first "Tests: N" of its line.
+    log = "Tests: 1 passed, 4 total Suite duration: 1s Tests: 9\n"
+    assert BaseUnitTests()._get_tests_count(log, test_tool="other") == 1
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+@pytest.mark.parametrize(
+    "tool, log, count",
+    [
+        ("gotest", "x\rRan 3 of 5 Specs in 1s", 5),
+        ("maven", "Skipped: 0, Errors: 0, Failures: 0, Tests run: 5,", 5),
+        ("rake", "1 tests pass, 2 assertions, 0 failures\n5 tests, 1 assertions, 0 failures", 0),
+    ],
+    ids=["carriage-return-splits-line", "maven-any-order", "unparsed-summary-stops"],
+)
+def test_tests_count_line_rules(tool, log, count, encode):
+    log = log.encode() if encode else log
+    assert BaseUnitTests()._get_tests_count(log, test_tool=tool) == count
@@ -0,0 +1,79 @@
+import pytest
+
+from sitreps_client.utils import helpers
+
+
+class FakeTime:
+    """Clock advanced only by `sleep`."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(helpers, "time", clock)
+    monkeypatch.setattr(helpers.random, "uniform", lambda a, b: 0)
+    return clock
+
+
+@pytest.mark.parametrize("fails_with", [None, RuntimeError("boom")], ids=["falsy", "exception"])
+def test_wait_for_schedule(fake_time, fails_with):
+    attempts = []
+
+    def func():
+        attempts.append(fake_time.now)
+        if fails_with:
+            raise fails_with
+        return None
+
+    response, err, tries = helpers.wait_for(func, delay=2, num_sec=7)
+
+    assert attempts == [0, 2, 6, 7]
+    assert fake_time.sleeps == [2, 4, 1]
+    assert tries == 4
+    assert response is None
+    assert err is fails_with
+
+
+def test_wait_for_success(fake_time):
+    results = iter([RuntimeError("boom"), None, "ok"])
+
+    def func():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert helpers.wait_for(func, delay=1, num_sec=10) == ("ok", None, 3)
+    assert fake_time.sleeps == [1, 2]
+
+
+def test_merge_dicts():
+    dict_a = {"repo": {"cloc": {"suffix": "py", "skip": ["b", "a"]}, "branch": "master"}, "x": 1}
+    dict_b = {"repo": {"cloc": {"skip": ("c", "a"), "exclude": True}, "branch": "main"}, "y": 2}
+
+    merged = helpers.merge_dicts(dict_a, dict_b)
+
+    assert merged == {
+        "repo": {
+            "cloc": {"suffix": "py", "skip": ["a", "b", "c"], "exclude": True},
+            "branch": "main",
+        },
+        "x": 1,
+        "y": 2,
+    }
+
+
+def test_merge_dicts_into_non_dict():
+    with pytest.raises(ValueError):
+        helpers.merge_dicts({"repo": "name"}, {"repo": {"branch": "main"}})